@@ -10,6 +10,22 @@ COPERNICUS_API_URL: str = "https://scihub.copernicus.eu/dhus"
 
 # AWS S3 settings for Sentinel data
 AWS_S3_BUCKET: str = "sentinel-s2-l2a"
+AWS_S3_MAX_WORKERS: int = 16  # Parallel file downloads
+
+# Files above the threshold (e.g. JP2 bands) are fetched as parallel ranged
+# GETs. The threshold and chunk size match boto3's defaults; per-file
+# concurrency is lowered from 10 because files already download in parallel.
+AWS_S3_MULTIPART_THRESHOLD: int = 8 << 20  # 8 MiB
+AWS_S3_MULTIPART_CHUNKSIZE: int = 8 << 20  # 8 MiB
+AWS_S3_TRANSFER_MAX_CONCURRENCY: int = 4  # Ranged GETs per file
+
+# Up to workers x per-file concurrency transfer threads (64) run at once;
+# keep one pooled HTTP connection for each
+AWS_S3_MAX_POOL_CONNECTIONS: int = AWS_S3_MAX_WORKERS * AWS_S3_TRANSFER_MAX_CONCURRENCY
+
+# S3 listings are cached on disk; tile contents don't change once ingested
+S3_LISTING_CACHE_DIR: str = ".s3cache"
+S3_LISTING_CACHE_TTL: int = 24 * 60 * 60  # Seconds
 
 # Default query parameters
 DEFAULT_PLATFORM: str = "Sentinel-2"
@@ -12,6 +12,19 @@ CDSE_TOKEN_URL: str = "https://identity.dataspace.copernicus.eu/auth/realms/CDSE
 CDSE_ODATA_URL: str = "https://catalogue.dataspace.copernicus.eu/odata/v1/Products"
 CDSE_DOWNLOAD_URL: str = "https://zipper.dataspace.copernicus.eu/odata/v1/Products"
 
+# Access tokens are cached here between runs (keyed by username)
+CDSE_TOKEN_CACHE_PATH: str = "~/.cache/cdse_token.json"
+CDSE_TOKEN_EXPIRY_MARGIN: int = 30  # Seconds to treat a token as expired early
+
+# HTTP session settings
+CDSE_POOL_CONNECTIONS: int = 16  # Number of host connection pools to cache
+CDSE_POOL_MAXSIZE: int = 32  # Connections kept open per host
+CDSE_MAX_RETRIES: int = 8  # Retries for throttled (429) or failed (5xx) requests
+CDSE_RETRY_BACKOFF: float = 1.0  # Exponential backoff factor in seconds
+CDSE_DOWNLOAD_CHUNK_SIZE: int = 1 << 20  # 1 MiB
+CDSE_PROGRESS_INTERVAL: float = 0.5  # Minimum seconds between progress bar redraws
+CDSE_MAX_CONCURRENT_DOWNLOADS: int = 4  # Stay within CDSE's per-user connection limit
+
 # Default search parameters
 DEFAULT_COLLECTION: str = "SENTINEL-2"
 DEFAULT_PRODUCT_TYPE: str = "S2MSI2A"  # Level-2A (atmospherically corrected)
@@ -35,3 +48,4 @@ EXAMPLE_AOI_GEOJSON = {
 
 # AWS S3 settings for Sentinel data (still works with CDSE)
 AWS_S3_BUCKET: str = "sentinel-s2-l2a"
+AWS_S3_MAX_POOL_CONNECTIONS: int = 32  # HTTP connections kept open by the S3 client
@@ -1,10 +1,19 @@
 """Simple script to download Sentinel satellite imagery using free alternatives to SentinelHub."""
 
+import functools
+import hashlib
+import json
 import os
+import posixpath
+import re
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore import UNSIGNED
 from botocore.config import Config
 import pandas as pd
@@ -13,6 +22,14 @@ from sentinelsat import SentinelAPI, geojson_to_wkt
 import config
 
 
+# Sentinel-2 L2A product title, e.g.
+# S2A_MSIL2A_20250101T103421_N0511_R008_T30UXC_20250101T123456
+# Groups: year, month, day, UTM zone, latitude band, grid square
+PRODUCT_TITLE_PATTERN = re.compile(
+    r'^S2[A-Z]_MSIL2A_(\d{4})(\d{2})(\d{2})T\d{6}_N\d{4}_R\d{3}_T(\d{2})([A-Z])([A-Z]{2})_'
+)
+
+
 def setup_copernicus_api() -> SentinelAPI:
     """
     Set up connection to Copernicus Open Access Hub API.
@@ -72,7 +89,8 @@ def query_sentinel_products(
         max_cloud_cover: Maximum cloud cover percentage (0-100).
         
     Returns:
-        pd.DataFrame: DataFrame containing query results with product metadata.
+        pd.DataFrame: DataFrame with 'uuid', 'title' and 'cloudcoverpercentage'
+        columns for each matching product.
         
     Raises:
         ValueError: If no products are found for the specified criteria.
@@ -91,7 +109,19 @@ def query_sentinel_products(
         cloudcoverpercentage=(0, max_cloud_cover)
     )
     
-    products_df = api.to_dataframe(products)
+    # Keep only the fields used downstream rather than hydrating every
+    # metadata column with api.to_dataframe
+    products_df = pd.DataFrame(
+        [
+            (uuid, properties.get('title'), properties.get('cloudcoverpercentage'))
+            for uuid, properties in products.items()
+        ],
+        columns=['uuid', 'title', 'cloudcoverpercentage']
+    ).astype({
+        'uuid': 'string[pyarrow]',
+        'title': 'string[pyarrow]',
+        'cloudcoverpercentage': 'float32'
+    })
     
     if products_df.empty:
         raise ValueError(
@@ -112,9 +142,16 @@ def select_best_product(products_df: pd.DataFrame) -> tuple[str, str]:
         
     Returns:
         tuple[str, str]: Product UUID and title of the selected product.
+        
+    Raises:
+        ValueError: If no product has a cloud cover value.
     """
-    # Sort by cloud cover (ascending) and select the first product
-    best_product = products_df.sort_values('cloudcoverpercentage').iloc[0]
+    cloud_covers = products_df['cloudcoverpercentage']
+    if cloud_covers.isna().all():
+        raise ValueError("No products with cloud cover information were found")
+    
+    # Select the product with the lowest cloud cover in a single linear pass
+    best_product = products_df.loc[cloud_covers.idxmin()]
     
     product_id = best_product['uuid']
     product_title = best_product['title']
@@ -126,14 +163,26 @@ def select_best_product(products_df: pd.DataFrame) -> tuple[str, str]:
     return product_id, product_title
 
 
+@functools.lru_cache(maxsize=1)
 def setup_aws_s3_client() -> boto3.client:
     """
     Set up AWS S3 client for accessing public Sentinel data.
     
+    The client is created once and reused, so repeated calls share its
+    pool of keep-alive connections.
+    
     Returns:
         boto3.client: Configured S3 client with unsigned requests.
     """
-    return boto3.client('s3', config=Config(signature_version=UNSIGNED))
+    return boto3.client(
+        's3',
+        config=Config(
+            signature_version=UNSIGNED,
+            max_pool_connections=config.AWS_S3_MAX_POOL_CONNECTIONS,
+            retries={'max_attempts': 10, 'mode': 'adaptive'},
+            tcp_keepalive=True
+        )
+    )
 
 
 def construct_s3_path(product_title: str) -> str:
@@ -146,71 +195,237 @@ def construct_s3_path(product_title: str) -> str:
     Returns:
         str: S3 path prefix for the product.
         
+    Raises:
+        ValueError: If the title is not a Sentinel-2 L2A product title.
+        
     Example:
         For product 'S2A_MSIL2A_20250101T103421_N0511_R008_T30UXC_20250101T123456',
-        returns 'tiles/10/S/UG/2025/1/1/'
+        returns 'tiles/30/U/XC/2025/1/1/'
+    """
+    match = PRODUCT_TITLE_PATTERN.match(product_title)
+    if match is None:
+        raise ValueError(f"Unrecognised product title: {product_title}")
+    
+    year, month, day, utm_zone, latitude_band, square = match.groups()
+    
+    # Month and day have no leading zero in the S3 layout
+    return f"tiles/{utm_zone}/{latitude_band}/{square}/{year}/{int(month)}/{int(day)}/"
+
+
+def construct_s3_paths(product_titles: pd.Series) -> pd.Series:
+    """
+    Construct S3 path prefixes for a Series of Sentinel-2 L2A product titles.
+    
+    Vectorized equivalent of construct_s3_path for building many prefixes
+    at once, e.g. from the 'title' column of query results.
+    
+    Args:
+        product_titles: Series of full product titles.
+        
+    Returns:
+        pd.Series: S3 path prefix for each title, or a missing value where a
+        title does not match the expected format (pd.NA for string dtypes
+        such as string[pyarrow], NaN for object dtype).
+    """
+    parts = product_titles.str.extract(PRODUCT_TITLE_PATTERN)
+    year, month, day, utm_zone, latitude_band, square = (parts[i] for i in range(6))
+    
+    # Month and day have no leading zero in the S3 layout
+    month = month.str.lstrip('0')
+    day = day.str.lstrip('0')
+    
+    return (
+        'tiles/' + utm_zone + '/' + latitude_band + '/' + square + '/'
+        + year + '/' + month + '/' + day + '/'
+    )
+
+
+def is_number(value: Any) -> bool:
+    """
+    Check whether a value loaded from JSON is an int or float (not a bool).
+    
+    Args:
+        value: Value to check.
+        
+    Returns:
+        bool: True if the value is numeric.
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def listing_cache_path(bucket: str, s3_path: str) -> str:
+    """
+    Get the local cache file path for an S3 listing.
+    
+    Args:
+        bucket: S3 bucket name.
+        s3_path: S3 path prefix.
+        
+    Returns:
+        str: Path of the JSON file caching the listing.
+    """
+    digest = hashlib.sha256(f"{bucket}/{s3_path}".encode()).hexdigest()
+    return os.path.join(config.S3_LISTING_CACHE_DIR, f"{digest}.json")
+
+
+def load_cached_listing(bucket: str, s3_path: str) -> Optional[List[Tuple[str, int]]]:
+    """
+    Load a cached S3 listing if one exists and has not expired.
+    
+    Args:
+        bucket: S3 bucket name.
+        s3_path: S3 path prefix.
+        
+    Returns:
+        Optional[List[Tuple[str, int]]]: Cached object keys and sizes, or None
+        if there is no valid cache entry.
+    """
+    try:
+        with open(listing_cache_path(bucket, s3_path)) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    # Treat anything that isn't a well-formed, unexpired entry as a cache miss
+    if not isinstance(entry, dict):
+        return None
+    
+    expires_at = entry.get("expires_at")
+    if not is_number(expires_at) or expires_at <= time.time():
+        return None
+    
+    files = entry.get("files")
+    if not isinstance(files, list):
+        return None
+    
+    for file in files:
+        if not (
+            isinstance(file, list)
+            and len(file) == 2
+            and isinstance(file[0], str)
+            and isinstance(file[1], int)
+            and not isinstance(file[1], bool)
+        ):
+            return None
+    
+    return [(key, size) for key, size in files]
+
+
+def save_cached_listing(bucket: str, s3_path: str, files: List[Tuple[str, int]]) -> None:
     """
-    # Extract tile information from product title
-    # Format: S2X_MSIL2A_YYYYMMDDTHHMMSS_NXXXX_RXXX_TXXXXX_YYYYMMDDTHHMMSS
-    tile_id = product_title[38:44]  # Extract TXXXXX part
-    utm_zone = tile_id[1:3]        # Extract zone (e.g., '30')
-    latitude_band = tile_id[3:4]   # Extract latitude band (e.g., 'U')
-    square = tile_id[4:6]          # Extract square (e.g., 'XC')
+    Save an S3 listing to the local cache.
     
-    # Extract date information
-    date_part = product_title[11:19]  # Extract YYYYMMDD
-    year = date_part[:4]
-    month = str(int(date_part[4:6]))  # Remove leading zero
-    day = str(int(date_part[6:8]))    # Remove leading zero
+    Args:
+        bucket: S3 bucket name.
+        s3_path: S3 path prefix.
+        files: Object keys and sizes to cache.
+    """
+    cache_path = listing_cache_path(bucket, s3_path)
+    os.makedirs(config.S3_LISTING_CACHE_DIR, exist_ok=True)
+    
+    entry = {
+        "bucket": bucket,
+        "prefix": s3_path,
+        "expires_at": time.time() + config.S3_LISTING_CACHE_TTL,
+        "files": files
+    }
     
-    s3_path = f"tiles/{utm_zone}/{latitude_band}/{square}/{year}/{month}/{day}/"
-    return s3_path
+    # Write to a uniquely named file then rename, so concurrent runs or
+    # threads never read a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=config.S3_LISTING_CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
 
-def list_product_files(s3_client: boto3.client, s3_path: str) -> List[str]:
+def list_product_files(
+    s3_client: boto3.client,
+    s3_path: str,
+    use_cache: bool = True
+) -> List[Tuple[str, int]]:
     """
     List available files for a Sentinel product in S3.
     
+    Listings are cached on disk for config.S3_LISTING_CACHE_TTL seconds, as
+    tile contents don't change once published.
+    
     Args:
         s3_client: Configured S3 client.
         s3_path: S3 path prefix for the product.
+        use_cache: Whether to read and write the on-disk listing cache.
         
     Returns:
-        List[str]: List of S3 object keys for the product files.
+        List[Tuple[str, int]]: S3 object key and size in bytes of each product file.
         
     Raises:
         ValueError: If no files are found at the specified S3 path.
     """
     print(f"Listing files at s3://{config.AWS_S3_BUCKET}/{s3_path}")
     
-    response = s3_client.list_objects_v2(
+    if use_cache:
+        files = load_cached_listing(config.AWS_S3_BUCKET, s3_path)
+        if files:
+            print(f"Found {len(files)} files (cached listing)")
+            return files
+    
+    # list_objects_v2 returns at most 1000 keys per call, so page through them
+    paginator = s3_client.get_paginator('list_objects_v2')
+    pages = paginator.paginate(
         Bucket=config.AWS_S3_BUCKET, 
-        Prefix=s3_path
+        Prefix=s3_path,
+        PaginationConfig={'PageSize': 1000}
     )
     
-    if 'Contents' not in response:
+    files = [
+        (obj['Key'], obj['Size'])
+        for page in pages
+        for obj in page.get('Contents', [])
+    ]
+    
+    if not files:
         raise ValueError(f"No files found at S3 path: {s3_path}")
     
-    file_keys = [obj['Key'] for obj in response['Contents']]
-    print(f"Found {len(file_keys)} files")
+    print(f"Found {len(files)} files")
+    
+    if use_cache:
+        try:
+            save_cached_listing(config.AWS_S3_BUCKET, s3_path, files)
+        except OSError as e:
+            print(f"Warning: could not cache S3 listing: {e}")
     
-    return file_keys
+    return files
 
 
 def download_product_files(
     s3_client: boto3.client, 
-    file_keys: List[str], 
+    files: List[Tuple[str, int]], 
     product_title: str,
-    output_dir: Optional[str] = None
+    output_dir: Optional[str] = None,
+    max_workers: int = config.AWS_S3_MAX_WORKERS,
+    s3_path: Optional[str] = None
 ) -> str:
     """
     Download Sentinel product files from S3 to local directory.
     
+    Files are fetched in parallel over the S3 client's connection pool, and
+    large files are split into parallel ranged requests. The directory layout
+    below s3_path is preserved. Files that already exist locally with the same
+    size as in S3 are skipped, so an interrupted download can be resumed by
+    running again.
+    
     Args:
         s3_client: Configured S3 client.
-        file_keys: List of S3 object keys to download.
+        files: S3 object keys and sizes to download, as returned by
+            list_product_files.
         product_title: Product title for creating output directory.
         output_dir: Custom output directory. If None, uses product title.
+        max_workers: Maximum number of files to download concurrently.
+        s3_path: S3 prefix the local layout is relative to. If None, uses the
+            common directory of all file keys.
         
     Returns:
         str: Path to the output directory containing downloaded files.
@@ -220,17 +435,45 @@ def download_product_files(
     
     os.makedirs(output_dir, exist_ok=True)
     
-    print(f"Downloading {len(file_keys)} files to {output_dir}")
+    if s3_path is None:
+        s3_path = posixpath.commonpath([posixpath.dirname(key) for key, _ in files]) if files else ""
     
-    for file_key in file_keys:
-        file_name = os.path.join(output_dir, file_key.split('/')[-1])
-        print(f"Downloading {file_key.split('/')[-1]}")
+    transfer_config = TransferConfig(
+        multipart_threshold=config.AWS_S3_MULTIPART_THRESHOLD,
+        multipart_chunksize=config.AWS_S3_MULTIPART_CHUNKSIZE,
+        max_concurrency=config.AWS_S3_TRANSFER_MAX_CONCURRENCY,
+        use_threads=True
+    )
+    
+    print(f"Downloading {len(files)} files to {output_dir}")
+    
+    def download_file(file: Tuple[str, int]) -> Tuple[str, bool]:
+        file_key, size = file
+        
+        # Keep subfolders so files sharing a basename don't overwrite each other
+        relative_key = file_key
+        if file_key.startswith(s3_path):
+            relative_key = file_key[len(s3_path):].lstrip('/')
+        file_name = os.path.join(output_dir, *relative_key.split('/'))
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+        
+        # download_file only moves a file into place once it is complete,
+        # so a matching size means the file is already downloaded
+        if os.path.exists(file_name) and os.path.getsize(file_name) == size:
+            return relative_key, False
         
         s3_client.download_file(
             config.AWS_S3_BUCKET, 
             file_key, 
-            file_name
+            file_name,
+            Config=transfer_config
         )
+        return relative_key, True
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for relative_key, downloaded in executor.map(download_file, files):
+            status = "Downloaded" if downloaded else "Skipped (already downloaded)"
+            print(f"{status} {relative_key}")
     
     print(f"Download complete. Files saved to {output_dir}")
     return output_dir
@@ -245,30 +488,37 @@ def main() -> None:
         print("Setting up Copernicus API connection...")
         api = setup_copernicus_api()
         
-        # Step 2: Define area of interest
-        print("Creating area of interest...")
-        footprint = create_area_of_interest(config.EXAMPLE_AOI)
-        
-        # Step 3: Query products
-        print("Querying Sentinel products...")
-        products_df = query_sentinel_products(api, footprint)
-        
-        # Step 4: Select best product
-        print("Selecting best product...")
-        product_id, product_title = select_best_product(products_df)
-        
-        # Step 5: Set up AWS S3 client
-        print("Setting up AWS S3 client...")
-        s3_client = setup_aws_s3_client()
+        # The S3 client doesn't depend on the query, so build it in the
+        # background while the query runs
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            print("Setting up AWS S3 client...")
+            s3_client_future = executor.submit(setup_aws_s3_client)
+            
+            # Step 2: Define area of interest
+            print("Creating area of interest...")
+            footprint = create_area_of_interest(config.EXAMPLE_AOI)
+            
+            # Step 3: Query products
+            print("Querying Sentinel products...")
+            products_df = query_sentinel_products(api, footprint)
+            
+            # Step 4: Select best product
+            print("Selecting best product...")
+            product_id, product_title = select_best_product(products_df)
+            
+            # Step 5: Wait for the AWS S3 client
+            s3_client = s3_client_future.result()
         
         # Step 6: Construct S3 path and list files
         print("Constructing S3 path...")
         s3_path = construct_s3_path(product_title)
-        file_keys = list_product_files(s3_client, s3_path)
+        files = list_product_files(s3_client, s3_path)
         
         # Step 7: Download files
         print("Starting download...")
-        output_dir = download_product_files(s3_client, file_keys, product_title)
+        output_dir = download_product_files(
+            s3_client, files, product_title, s3_path=s3_path
+        )
         
         print("\n✅ Process completed successfully!")
         print(f"📁 Files downloaded to: {output_dir}")
@@ -5,54 +5,146 @@ This script replaces the deprecated Copernicus Open Access Hub with the new CDSE
 Works with the current system as of 2025.
 """
 
+import functools
 import os
 import json
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
 from typing import Dict, Any, List, Optional, Tuple
 from urllib.parse import quote
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import boto3
 from botocore import UNSIGNED
 from botocore.config import Config
 import pandas as pd
+from tqdm import tqdm
 
 import config_cdse
 
 
-def get_access_token() -> str:
+class LoggingRetry(Retry):
+    """Retry policy that reports each retry, so throttling is visible."""
+    
+    def increment(self, method=None, url=None, response=None, error=None, *args, **kwargs):
+        retry = super().increment(method, url, response, error, *args, **kwargs)
+        reason = f"status {response.status}" if response is not None else error
+        print(f"Warning: retrying {method} {url} after {reason} "
+              f"({retry.total} retries left)")
+        return retry
+
+
+def create_session() -> requests.Session:
     """
-    Get access token from CDSE identity service.
+    Create an HTTP session with pooled keep-alive connections for CDSE.
+    
+    Throttled (429) and failed (5xx) GET and POST requests are retried with
+    exponential backoff, waiting for the server's Retry-After when given.
     
     Returns:
-        str: Access token for API authentication.
-        
-    Raises:
-        ValueError: If credentials are not configured or authentication fails.
+        requests.Session: Session that retries transient server errors.
     """
-    if not config_cdse.CDSE_USERNAME or not config_cdse.CDSE_PASSWORD:
-        raise ValueError(
-            "Please set CDSE_USERNAME and CDSE_PASSWORD in config_cdse.py. "
-            "Register at https://dataspace.copernicus.eu/"
-        )
+    session = requests.Session()
+    retry = LoggingRetry(
+        total=config_cdse.CDSE_MAX_RETRIES,
+        backoff_factor=config_cdse.CDSE_RETRY_BACKOFF,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(["GET", "POST"]),
+        respect_retry_after_header=True
+    )
+    session.mount("https://", HTTPAdapter(
+        pool_connections=config_cdse.CDSE_POOL_CONNECTIONS,
+        pool_maxsize=config_cdse.CDSE_POOL_MAXSIZE,
+        max_retries=retry
+    ))
+    return session
+
+
+# Shared session so token, search and download requests reuse connections
+_SESSION = create_session()
+
+
+def load_token_cache() -> Dict[str, Any]:
+    """
+    Load cached CDSE tokens from disk.
     
-    data = {
-        "client_id": "cdse-public",
-        "username": config_cdse.CDSE_USERNAME,
-        "password": config_cdse.CDSE_PASSWORD,
-        "grant_type": "password"
-    }
+    Returns:
+        Dict[str, Any]: Cached token entries keyed by username, or an empty
+        dict if the cache is missing or unreadable.
+    """
+    cache_path = os.path.expanduser(config_cdse.CDSE_TOKEN_CACHE_PATH)
     
     try:
-        response = requests.post(
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_token_cache(cache: Dict[str, Any]) -> None:
+    """
+    Write cached CDSE tokens to disk, readable only by the current user.
+    
+    The cache is written to a uniquely named temporary file and moved into
+    place, so concurrent runs or threads never read a partially written file.
+    
+    Args:
+        cache: Token entries keyed by username.
+    """
+    cache_path = os.path.expanduser(config_cdse.CDSE_TOKEN_CACHE_PATH)
+    cache_dir = os.path.dirname(cache_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    
+    # mkstemp creates the file with 0600 permissions
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def request_token(data: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Request tokens from CDSE identity service.
+    
+    Args:
+        data: Form data for the token request (password or refresh_token grant).
+        
+    Returns:
+        Dict[str, Any]: Token entry with 'access_token', 'refresh_token',
+        'expires_at' and 'refresh_expires_at' keys.
+        
+    Raises:
+        ValueError: If the request fails or the response has no access token.
+    """
+    try:
+        response = _SESSION.post(
             config_cdse.CDSE_TOKEN_URL,
             data=data,
             headers={'Content-Type': 'application/x-www-form-urlencoded'}
         )
         response.raise_for_status()
         
-        return response.json()["access_token"]
+        token = response.json()
+        now = time.time()
+        margin = config_cdse.CDSE_TOKEN_EXPIRY_MARGIN
+        
+        return {
+            "access_token": token["access_token"],
+            "refresh_token": token.get("refresh_token"),
+            "expires_at": now + token.get("expires_in", 0) - margin,
+            "refresh_expires_at": now + token.get("refresh_expires_in", 0) - margin
+        }
     
     except requests.exceptions.RequestException as e:
         raise ValueError(f"Failed to get access token: {e}")
@@ -60,6 +152,88 @@ def get_access_token() -> str:
         raise ValueError("Invalid response from token service - check credentials")
 
 
+def get_access_token_entry() -> Dict[str, Any]:
+    """
+    Get an access token and its expiry from CDSE identity service.
+    
+    A cached token is returned while it is still valid. Otherwise the cached
+    refresh token is used, falling back to the username and password.
+    
+    Returns:
+        Dict[str, Any]: Token entry with at least 'access_token' and
+        'expires_at' (a Unix timestamp, already reduced by the expiry margin).
+        
+    Raises:
+        ValueError: If credentials are not configured or authentication fails.
+    """
+    if not config_cdse.CDSE_USERNAME or not config_cdse.CDSE_PASSWORD:
+        raise ValueError(
+            "Please set CDSE_USERNAME and CDSE_PASSWORD in config_cdse.py. "
+            "Register at https://dataspace.copernicus.eu/"
+        )
+    
+    cache = load_token_cache()
+    cached = cache.get(config_cdse.CDSE_USERNAME)
+    if not isinstance(cached, dict):
+        cached = {}
+    now = time.time()
+    
+    # Any malformed field is treated as a cache miss for that token
+    def is_valid(token_key: str, expiry_key: str) -> bool:
+        expires_at = cached.get(expiry_key)
+        return (
+            isinstance(cached.get(token_key), str)
+            and isinstance(expires_at, (int, float))
+            and not isinstance(expires_at, bool)
+            and expires_at > now
+        )
+    
+    if is_valid("access_token", "expires_at"):
+        return cached
+    
+    token = None
+    if is_valid("refresh_token", "refresh_expires_at"):
+        try:
+            token = request_token({
+                "client_id": "cdse-public",
+                "refresh_token": cached["refresh_token"],
+                "grant_type": "refresh_token"
+            })
+        except ValueError:
+            token = None
+    
+    if token is None:
+        token = request_token({
+            "client_id": "cdse-public",
+            "username": config_cdse.CDSE_USERNAME,
+            "password": config_cdse.CDSE_PASSWORD,
+            "grant_type": "password"
+        })
+    
+    cache[config_cdse.CDSE_USERNAME] = token
+    try:
+        save_token_cache(cache)
+    except OSError as e:
+        print(f"Warning: could not cache access token: {e}")
+    
+    return token
+
+
+def get_access_token() -> str:
+    """
+    Get access token from CDSE identity service.
+    
+    See get_access_token_entry for how cached and refresh tokens are used.
+    
+    Returns:
+        str: Access token for API authentication.
+        
+    Raises:
+        ValueError: If credentials are not configured or authentication fails.
+    """
+    return get_access_token_entry()["access_token"]
+
+
 def geojson_to_wkt(geojson: Dict[str, Any]) -> str:
     """
     Convert GeoJSON polygon to WKT format for CDSE API.
@@ -69,16 +243,38 @@ def geojson_to_wkt(geojson: Dict[str, Any]) -> str:
         
     Returns:
         str: Well-Known Text (WKT) representation of the polygon.
+        
+    Raises:
+        ValueError: If the geometry is not a polygon of [lon, lat] pairs.
     """
     if geojson["type"] != "Polygon":
         raise ValueError("Only Polygon geometry is supported")
     
     coords = geojson["coordinates"][0]  # Exterior ring
-    wkt_coords = ", ".join([f"{lon} {lat}" for lon, lat in coords])
+    
+    # Unpacking each vertex also rejects anything that isn't a [lon, lat] pair
+    try:
+        wkt_coords = ", ".join([f"{lon} {lat}" for lon, lat in coords])
+    except (TypeError, ValueError):
+        raise ValueError("Polygon coordinates must be [lon, lat] pairs")
     
     return f"POLYGON(({wkt_coords}))"
 
 
+@functools.lru_cache(maxsize=256)
+def _format_yyyymmdd(date_string: str) -> str:
+    """Parse a YYYYMMDD string and format it as an ISO 8601 timestamp."""
+    # strptime alone accepts short forms like '2025011', so require 8 digits
+    message = f"Invalid date string (expected YYYYMMDD): {date_string!r}"
+    if len(date_string) != 8 or not (date_string.isascii() and date_string.isdigit()):
+        raise ValueError(message)
+    try:
+        parsed = datetime.strptime(date_string, "%Y%m%d")
+    except ValueError:
+        raise ValueError(message)
+    return parsed.strftime("%Y-%m-%dT00:00:00.000Z")
+
+
 def format_date_for_cdse(date_input: Any) -> str:
     """
     Format date for CDSE OData API.
@@ -88,14 +284,16 @@ def format_date_for_cdse(date_input: Any) -> str:
         
     Returns:
         str: ISO 8601 formatted date string.
+        
+    Raises:
+        ValueError: If the input type is unsupported or the string is not a
+        valid YYYYMMDD date.
     """
     if isinstance(date_input, str):
-        # Assume YYYYMMDD format
-        return f"{date_input[:4]}-{date_input[4:6]}-{date_input[6:8]}T00:00:00.000Z"
-    elif isinstance(date_input, (date, datetime)):
+        return _format_yyyymmdd(date_input)
+    if isinstance(date_input, date):  # Also covers datetime
         return date_input.strftime("%Y-%m-%dT00:00:00.000Z")
-    else:
-        raise ValueError(f"Unsupported date format: {type(date_input)}")
+    raise ValueError(f"Unsupported date format: {type(date_input)}")
 
 
 def build_odata_filter(
@@ -140,7 +338,7 @@ def build_odata_filter(
     return " and ".join(filter_parts)
 
 
-def search_products(
+def query_products(
     access_token: str,
     area_wkt: str,
     start_date: str = "20250101",
@@ -149,9 +347,9 @@ def search_products(
     product_type: str = config_cdse.DEFAULT_PRODUCT_TYPE,
     max_cloud_cover: int = config_cdse.DEFAULT_MAX_CLOUD_COVER,
     max_results: int = 100
-) -> pd.DataFrame:
+) -> List[Dict[str, Any]]:
     """
-    Search for Sentinel products using CDSE OData API.
+    Query the CDSE OData API and return the raw product records.
     
     Args:
         access_token: CDSE access token.
@@ -164,7 +362,7 @@ def search_products(
         max_results: Maximum number of results to return.
         
     Returns:
-        pd.DataFrame: DataFrame containing search results.
+        List[Dict[str, Any]]: Product records from the response 'value' list.
         
     Raises:
         ValueError: If no products are found or API request fails.
@@ -182,12 +380,14 @@ def search_products(
         product_type, max_cloud_cover
     )
     
-    # Build query URL
+    # Build query URL, requesting only the fields used by process_product_attributes.
+    # Attributes (cloud cover, product type) are only returned when expanded.
     params = {
         "$filter": odata_filter,
+        "$select": "Id,Name,ContentLength,ContentDate",
+        "$expand": "Attributes",
         "$orderby": "ContentDate/Start desc",
-        "$top": max_results,
-        "$count": "true"
+        "$top": max_results
     }
     
     headers = {
@@ -199,7 +399,7 @@ def search_products(
     print(f"Product type: {product_type}, Max cloud cover: {max_cloud_cover}%")
     
     try:
-        response = requests.get(
+        response = _SESSION.get(
             config_cdse.CDSE_ODATA_URL,
             params=params,
             headers=headers
@@ -208,24 +408,166 @@ def search_products(
         
         data = response.json()
         
-        if not data.get("value"):
-            raise ValueError(
-                f"No products found for the specified criteria. "
-                f"Try expanding the date range or increasing cloud cover threshold."
-            )
+    except requests.exceptions.RequestException as e:
+        raise ValueError(f"API request failed: {e}")
+    
+    if not data.get("value"):
+        raise ValueError(
+            f"No products found for the specified criteria. "
+            f"Try expanding the date range or increasing cloud cover threshold."
+        )
+    
+    return data["value"]
+
+
+def search_products(
+    access_token: str,
+    area_wkt: str,
+    start_date: str = "20250101",
+    end_date: Optional[str] = None,
+    collection: str = config_cdse.DEFAULT_COLLECTION,
+    product_type: str = config_cdse.DEFAULT_PRODUCT_TYPE,
+    max_cloud_cover: int = config_cdse.DEFAULT_MAX_CLOUD_COVER,
+    max_results: int = 100,
+    best_only: bool = False
+) -> pd.DataFrame:
+    """
+    Search for Sentinel products using CDSE OData API.
+    
+    Use find_best_product instead when only the lowest-cloud product is
+    needed; it skips building the DataFrame.
+    
+    Args:
+        access_token: CDSE access token.
+        area_wkt: Area of interest in WKT format.
+        start_date: Start date in YYYYMMDD format.
+        end_date: End date in YYYYMMDD format. If None, uses today's date.
+        collection: Data collection name.
+        product_type: Product type filter.
+        max_cloud_cover: Maximum cloud cover percentage.
+        max_results: Maximum number of results to return.
+        best_only: If True, return only the product with the lowest cloud cover.
+        
+    Returns:
+        pd.DataFrame: DataFrame containing search results.
         
-        # Convert to DataFrame
-        products_df = pd.DataFrame(data["value"])
+    Raises:
+        ValueError: If no products are found, best_only is set and no product
+        has a cloud cover value, or the API request fails.
+    """
+    products = query_products(
+        access_token, area_wkt, start_date, end_date, collection,
+        product_type, max_cloud_cover, max_results
+    )
+    
+    print(f"Found {len(products)} products")
+    
+    # CDSE OData cannot order by attribute values such as cloud cover,
+    # so the best product is picked here rather than server-side
+    if best_only:
+        products = [find_lowest_cloud_product(products)[0]]
+    
+    # Convert to DataFrame and extract useful attributes
+    return process_product_attributes(pd.DataFrame(products))
+
+
+def find_best_product(
+    access_token: str,
+    area_wkt: str,
+    start_date: str = "20250101",
+    end_date: Optional[str] = None,
+    collection: str = config_cdse.DEFAULT_COLLECTION,
+    product_type: str = config_cdse.DEFAULT_PRODUCT_TYPE,
+    max_cloud_cover: int = config_cdse.DEFAULT_MAX_CLOUD_COVER,
+    max_results: int = 100
+) -> Tuple[str, str]:
+    """
+    Search for products and select the one with the lowest cloud cover.
+    
+    Equivalent to search_products followed by select_best_product, but picks
+    the best product in a single pass over the raw response without building
+    a DataFrame.
+    
+    Args:
+        access_token: CDSE access token.
+        area_wkt: Area of interest in WKT format.
+        start_date: Start date in YYYYMMDD format.
+        end_date: End date in YYYYMMDD format. If None, uses today's date.
+        collection: Data collection name.
+        product_type: Product type filter.
+        max_cloud_cover: Maximum cloud cover percentage.
+        max_results: Maximum number of results to consider.
         
-        # Extract useful attributes
-        if not products_df.empty:
-            products_df = process_product_attributes(products_df)
+    Returns:
+        Tuple[str, str]: Product ID and title of the selected product.
         
-        print(f"Found {len(products_df)} products")
-        return products_df
+    Raises:
+        ValueError: If no products with a cloud cover value are found or
+        the API request fails.
+    """
+    products = query_products(
+        access_token, area_wkt, start_date, end_date, collection,
+        product_type, max_cloud_cover, max_results
+    )
+    
+    print(f"Found {len(products)} products")
+    
+    best, cloud_cover = find_lowest_cloud_product(products)
+    product_id = best.get("Id", "")
+    product_title = best.get("Name", "")
+    
+    print(f"Selected product: {product_title}")
+    print(f"Cloud cover: {cloud_cover:.1f}%")
+    
+    return product_id, product_title
+
+
+def find_lowest_cloud_product(products: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], float]:
+    """
+    Find the raw product record with the lowest cloud cover.
+    
+    Args:
+        products: Product records as returned by query_products.
         
-    except requests.exceptions.RequestException as e:
-        raise ValueError(f"API request failed: {e}")
+    Returns:
+        Tuple[Dict[str, Any], float]: The selected product record and its
+        cloud cover percentage.
+        
+    Raises:
+        ValueError: If no product has a cloud cover value.
+    """
+    # Keep a running minimum of (cloud cover, product), skipping products
+    # without a cloud cover attribute
+    best: Optional[Tuple[float, Dict[str, Any]]] = None
+    for product in products:
+        cloud_cover = get_attribute_value(product.get("Attributes") or [], "cloudCover")
+        if cloud_cover is None:
+            continue
+        if best is None or float(cloud_cover) < best[0]:
+            best = (float(cloud_cover), product)
+    
+    if best is None:
+        raise ValueError("No products with cloud cover information were found")
+    
+    cloud_cover, product = best
+    return product, cloud_cover
+
+
+def get_attribute_value(attributes: List[Dict[str, Any]], name: str) -> Any:
+    """
+    Get the value of a named attribute from a CDSE product's attribute list.
+    
+    Args:
+        attributes: List of attribute dicts with 'Name' and 'Value' keys.
+        name: Attribute name to look up (e.g., 'cloudCover').
+        
+    Returns:
+        Any: The attribute value, or None if it is not present.
+    """
+    return next(
+        (attr.get("Value") for attr in attributes if attr.get("Name") == name),
+        None
+    )
 
 
 def process_product_attributes(products_df: pd.DataFrame) -> pd.DataFrame:
@@ -238,29 +580,36 @@ def process_product_attributes(products_df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Processed DataFrame with extracted attributes.
     """
-    processed_df = products_df.copy()
+    def column(name: str, default: Any) -> pd.Series:
+        if name in products_df:
+            return products_df[name]
+        return pd.Series(default, index=products_df.index)
+    
+    attributes = [
+        attrs if isinstance(attrs, list) else []
+        for attrs in column("Attributes", None).tolist()
+    ]
     
-    # Extract common attributes
-    for idx, row in processed_df.iterrows():
-        attributes = row.get("Attributes", [])
-        
-        # Extract cloud cover
-        cloud_cover = None
-        product_type = None
-        
-        for attr in attributes:
-            if attr.get("Name") == "cloudCover":
-                cloud_cover = attr.get("Value")
-            elif attr.get("Name") == "productType":
-                product_type = attr.get("Value")
-        
-        processed_df.at[idx, "cloudcoverpercentage"] = cloud_cover
-        processed_df.at[idx, "producttype"] = product_type
-        processed_df.at[idx, "title"] = row.get("Name", "")
-        processed_df.at[idx, "uuid"] = row.get("Id", "")
-        processed_df.at[idx, "size"] = row.get("ContentLength", 0)
+    # Extract common attributes in a single pass over the column
+    processed_df = products_df.assign(
+        cloudcoverpercentage=pd.Series(
+            [get_attribute_value(a, "cloudCover") for a in attributes],
+            index=products_df.index,
+            dtype="float32"
+        ),
+        producttype=[get_attribute_value(a, "productType") for a in attributes],
+        title=column("Name", "").fillna(""),
+        uuid=column("Id", "").fillna(""),
+        size=column("ContentLength", 0).fillna(0)
+    )
     
-    return processed_df
+    # Arrow-backed strings are more compact than object dtype and keep
+    # string operations vectorized
+    return processed_df.astype({
+        "title": "string[pyarrow]",
+        "uuid": "string[pyarrow]",
+        "producttype": "string[pyarrow]"
+    })
 
 
 def select_best_product(products_df: pd.DataFrame) -> Tuple[str, str]:
@@ -272,9 +621,16 @@ def select_best_product(products_df: pd.DataFrame) -> Tuple[str, str]:
         
     Returns:
         Tuple[str, str]: Product ID and title of the selected product.
+        
+    Raises:
+        ValueError: If no product has a cloud cover value.
     """
-    # Sort by cloud cover (ascending) and select the first product
-    best_product = products_df.sort_values('cloudcoverpercentage').iloc[0]
+    cloud_covers = products_df['cloudcoverpercentage']
+    if cloud_covers.isna().all():
+        raise ValueError("No products with cloud cover information were found")
+    
+    # Select the product with the lowest cloud cover in a single linear pass
+    best_product = products_df.loc[cloud_covers.idxmin()]
     
     product_id = best_product['uuid']
     product_title = best_product['title']
@@ -290,7 +646,8 @@ def download_product_cdse(
     access_token: str,
     product_id: str,
     output_dir: str = ".",
-    filename: Optional[str] = None
+    filename: Optional[str] = None,
+    show_progress: bool = True
 ) -> str:
     """
     Download a product directly from CDSE.
@@ -300,6 +657,7 @@ def download_product_cdse(
         product_id: Product ID to download.
         output_dir: Directory to save the downloaded file.
         filename: Custom filename. If None, uses product ID.
+        show_progress: Whether to print download progress.
         
     Returns:
         str: Path to the downloaded file.
@@ -320,37 +678,99 @@ def download_product_cdse(
     print(f"URL: {download_url}")
     
     try:
-        with requests.get(download_url, headers=headers, stream=True) as response:
+        with _SESSION.get(download_url, headers=headers, stream=True) as response:
             response.raise_for_status()
             
             total_size = int(response.headers.get('content-length', 0))
             
-            with open(file_path, 'wb') as f:
-                downloaded = 0
-                for chunk in response.iter_content(chunk_size=8192):
+            # tqdm rate-limits its own redraws, unlike printing every chunk
+            with tqdm(
+                total=total_size or None,
+                unit='B',
+                unit_scale=True,
+                mininterval=config_cdse.CDSE_PROGRESS_INTERVAL,
+                disable=not show_progress
+            ) as progress, open(file_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=config_cdse.CDSE_DOWNLOAD_CHUNK_SIZE):
                     if chunk:
                         f.write(chunk)
-                        downloaded += len(chunk)
-                        
-                        if total_size > 0:
-                            progress = (downloaded / total_size) * 100
-                            print(f"\rProgress: {progress:.1f}%", end="", flush=True)
+                        progress.update(len(chunk))
         
-        print(f"\nDownload complete: {file_path}")
+        print(f"Download complete: {file_path}")
         return file_path
         
     except requests.exceptions.RequestException as e:
         raise ValueError(f"Download failed: {e}")
 
 
+def download_products_cdse(
+    product_ids: List[str],
+    output_dir: str = ".",
+    max_workers: int = config_cdse.CDSE_MAX_CONCURRENT_DOWNLOADS
+) -> List[str]:
+    """
+    Download several products from CDSE concurrently.
+    
+    Downloads share the module's HTTP session, so throttled or failed
+    requests are retried with backoff by its adapter. A batch can outlast a
+    single access token, so the current token is kept in memory and a new
+    one is requested whenever it has expired by the time a product starts.
+    
+    Args:
+        product_ids: Product IDs to download.
+        output_dir: Directory to save the downloaded files.
+        max_workers: Maximum number of products to download at once.
+        
+    Returns:
+        List[str]: Paths to the downloaded files, in the order of product_ids.
+        
+    Raises:
+        ValueError: If authentication or any download fails.
+    """
+    print(f"Downloading {len(product_ids)} products to {output_dir}")
+    
+    # Shared by all workers; the lock makes them reuse one refreshed token
+    # instead of each requesting their own
+    token_lock = threading.Lock()
+    token: Dict[str, Any] = {}
+    
+    def download(product_id: str) -> str:
+        with token_lock:
+            if token.get("expires_at", 0) <= time.time():
+                token.update(get_access_token_entry())
+            access_token = token["access_token"]
+        
+        return download_product_cdse(
+            access_token,
+            product_id,
+            output_dir=output_dir,
+            show_progress=False
+        )
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(download, product_ids))
+
+
+@functools.lru_cache(maxsize=1)
 def setup_aws_s3_client() -> boto3.client:
     """
     Set up AWS S3 client for accessing public Sentinel data.
     
+    The client is created once and reused, so repeated calls share its
+    pool of keep-alive connections.
+    
     Returns:
         boto3.client: Configured S3 client with unsigned requests.
     """
-    return boto3.client('s3', config=Config(signature_version=UNSIGNED))
+    return boto3.client(
+        's3',
+        config=Config(
+            signature_version=UNSIGNED,
+            max_pool_connections=config_cdse.AWS_S3_MAX_POOL_CONNECTIONS,
+            retries={'max_attempts': 10, 'mode': 'adaptive'},
+            tcp_keepalive=True
+        )
+    )
 
 
 def main() -> None:
@@ -370,15 +790,11 @@ def main() -> None:
         # area_wkt = geojson_to_wkt(config_cdse.EXAMPLE_AOI_GEOJSON)
         print(f"Area: {area_wkt}")
         
-        # Step 3: Search for products
-        print("\n🔍 Searching for Sentinel products...")
-        products_df = search_products(access_token, area_wkt)
-        
-        # Step 4: Select best product
-        print("\n⭐ Selecting best product...")
-        product_id, product_title = select_best_product(products_df)
+        # Step 3: Search for products and select the best one
+        print("\n🔍 Searching for the best Sentinel product...")
+        product_id, product_title = find_best_product(access_token, area_wkt)
         
-        # Step 5: Download product
+        # Step 4: Download product
         print("\n⬇️ Downloading product...")
         downloaded_file = download_product_cdse(
             access_token, 